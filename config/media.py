@@ -0,0 +1,159 @@
+"""
+Раздача загруженных пользователями файлов (аватары курсов и пользователей).
+
+Django только проверяет доступ, а сами байты отдаёт фронтовой прокси:
+nginx по X-Accel-Redirect или Apache/lighttpd по X-Sendfile (MEDIA_ACCEL_MODE).
+Без прокси файл отдаётся через FileResponse с поддержкой Range.
+Файлы с хешем содержимого в имени кешируются навсегда (immutable).
+"""
+
+import hashlib
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.deconstruct import deconstructible
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=3600"
+PRIVATE_IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+PRIVATE_CACHE = "private, max-age=3600"
+CHUNK_SIZE = 64 * 1024
+PUBLIC = "public"
+PRIVATE = "private"
+
+
+@deconstructible
+class ContentHashStorage(FileSystemStorage):
+    """
+    Хранилище, добавляющее к имени файла хеш содержимого: avatar.png -> avatar.1a2b3c4d5e6f.png.
+    Одинаковое имя всегда означает одинаковые байты, поэтому такие файлы можно кешировать навсегда.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        root, ext = posixpath.splitext(name)
+        name = f"{root}.{digest.hexdigest()[:12]}{ext}"
+        if self.exists(name):
+            # Те же байты уже лежат под этим именем
+            return name
+        return super().save(name, content, max_length)
+
+
+def media_access(user, path):
+    """
+    PUBLIC, если файл виден анонимам, PRIVATE, если только этому пользователю
+    (аватар черновика для автора или staff), и None, если файл ему недоступен.
+    """
+
+    # Импорт внутри функции: модели импортируют ContentHashStorage из этого модуля
+    from lms.models import Course
+    from users.models import CustomUser
+
+    # Аватары пользователей лежат в profiles/ (upload_to), всё остальное — аватары курсов,
+    # включая старые, загруженные в корень MEDIA_ROOT. Так проверка идёт по одному индексу.
+    if path.startswith("profiles/"):
+        return PUBLIC if CustomUser.objects.filter(avatar=path).exists() else None
+    courses = Course.objects.filter(avatar=path)
+    if courses.filter(publish=True).exists():
+        return PUBLIC
+    if not user.is_authenticated:
+        return None
+    if not user.is_staff:
+        courses = courses.filter(author=user)
+    return PRIVATE if courses.exists() else None
+
+
+def serve_media(request, path):
+    path = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден")
+    access = media_access(request.user, path) if fullpath.is_file() else None
+    if access is None:
+        raise Http404("Файл не найден")
+
+    statobj = fullpath.stat()
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), statobj.st_mtime):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_ACCEL_MODE == "nginx":
+        response = HttpResponse()
+        # Не-ASCII значение заголовка Django закодировал бы по RFC 2047, а nginx его не поймёт
+        response["X-Accel-Redirect"] = quote(settings.MEDIA_ACCEL_PREFIX + path)
+    elif settings.MEDIA_ACCEL_MODE == "sendfile":
+        response = HttpResponse()
+        response["X-Sendfile"] = quote(str(fullpath))
+    else:
+        response = file_response(request, fullpath, statobj.st_size)
+
+    if not isinstance(response, HttpResponseNotModified):
+        content_type, encoding = mimetypes.guess_type(str(fullpath))
+        response["Content-Type"] = content_type or "application/octet-stream"
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["Last-Modified"] = http_date(statobj.st_mtime)
+    # Приватные файлы не должны оседать в общих кешах и CDN
+    if access == PUBLIC:
+        response["Cache-Control"] = IMMUTABLE_CACHE if HASHED_NAME_RE.search(path) else DEFAULT_CACHE
+    else:
+        response["Cache-Control"] = PRIVATE_IMMUTABLE_CACHE if HASHED_NAME_RE.search(path) else PRIVATE_CACHE
+    return response
+
+
+def file_response(request, fullpath, size):
+    """
+    Отдаёт файл целиком через FileResponse или один запрошенный диапазон байт (206).
+    Несколько диапазонов в одном запросе не поддерживаем и отдаём файл целиком.
+    """
+
+    match = RANGE_RE.match(request.META.get("HTTP_RANGE", "").strip())
+    if not match or not any(match.groups()):
+        response = FileResponse(fullpath.open("rb"))
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start > end or start >= size:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    response = StreamingHttpResponse(read_range(fullpath, start, end - start + 1), status=206)
+    response["Content-Length"] = str(end - start + 1)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def read_range(fullpath, start, length):
+    with fullpath.open("rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
@@ -105,10 +105,33 @@ LOGOUT_REDIRECT_URL = "landing"
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = (BASE_DIR / 'static',)
+STATIC_ROOT = BASE_DIR / "staticfiles"
+# Отдавать собранную статику самим Django (когда перед ним нет nginx)
+SERVE_STATIC = os.getenv("SERVE_STATIC") == "True"
+# Хешированные имена требуют collectstatic, поэтому включаются только в проде
+STATIC_MANIFEST = os.getenv("STATIC_MANIFEST") == "True"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    # Хеши в именах + .gz/.br копии при collectstatic (см. config/static.py)
+    "staticfiles": {
+        "BACKEND": (
+            "config.static.CompressedManifestStaticFilesStorage"
+            if STATIC_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
 
 # Настройки для медиа файлов (загруженные пользователями)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Кто отдаёт байты медиа: "nginx" (X-Accel-Redirect), "sendfile" (X-Sendfile) или сам Django
+MEDIA_ACCEL_MODE = os.getenv("MEDIA_ACCEL_MODE", "")
+# internal-location в nginx, смотрящий на MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -127,4 +150,7 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
-}
\ No newline at end of file
+}
+
+# Redis для горячих данных (прогресс по урокам и т.п.)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
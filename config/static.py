@@ -0,0 +1,120 @@
+"""
+Статика с хешами в именах и заранее сжатыми копиями.
+
+collectstatic через CompressedManifestStaticFilesStorage кладёт в STATIC_ROOT
+файлы вида bootstrap.min.<hash>.css и рядом .gz/.br. Отдавать их может прокси
+(nginx: gzip_static on; brotli_static on; Cache-Control: immutable для /static/)
+или сам Django через serve_static, если включён SERVE_STATIC.
+"""
+
+import gzip
+import mimetypes
+import posixpath
+from pathlib import Path
+
+import brotli
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from config.media import DEFAULT_CACHE, HASHED_NAME_RE, IMMUTABLE_CACHE
+
+COMPRESS_EXTENSIONS = (".css", ".js", ".svg", ".json", ".txt", ".html", ".xml")
+# Кодировки в порядке предпочтения: (значение Content-Encoding, расширение файла)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # В репозитории нет .map для вендорных bootstrap-файлов, поэтому ссылки на них не переписываем
+    patterns = tuple(
+        (extension, tuple(pattern for pattern in extension_patterns if "sourceMappingURL" not in str(pattern)))
+        for extension, extension_patterns in ManifestStaticFilesStorage.patterns
+    )
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESS_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        variants = [
+            (".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+            (".br", brotli.compress(content, quality=11)),
+        ]
+        for suffix, compressed in variants:
+            # Сжатая копия, которая почти не меньше оригинала, только зря тратит Vary-кеш
+            if len(compressed) >= len(content) * 0.95:
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+
+def accepted_encodings(header):
+    """
+    Кодировки из Accept-Encoding, кроме явно запрещённых через q=0.
+    «*» разрешает все наши кодировки (ENCODINGS), которые не запрещены отдельно.
+    """
+
+    accepted, refused = set(), set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        params = params.replace(" ", "")
+        if not coding:
+            continue
+        try:
+            if params.startswith("q=") and float(params[2:]) == 0:
+                refused.add(coding)
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding)
+    if "*" in accepted:
+        accepted.update(encoding for encoding, _ in ENCODINGS if encoding not in refused)
+    return accepted
+
+
+def serve_static(request, path):
+    """
+    Отдаёт файл из STATIC_ROOT, выбирая .br/.gz копию по Accept-Encoding.
+    """
+
+    path = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден")
+    if not fullpath.is_file():
+        raise Http404("Файл не найден")
+
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    served, content_encoding = fullpath, None
+    for encoding, suffix in ENCODINGS:
+        candidate = fullpath.with_name(fullpath.name + suffix)
+        if encoding in accepted and candidate.is_file():
+            served, content_encoding = candidate, encoding
+            break
+
+    statobj = served.stat()
+    if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), statobj.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(served.open("rb"), content_type=content_type or "application/octet-stream")
+        if content_encoding:
+            response["Content-Encoding"] = content_encoding
+    response["Last-Modified"] = http_date(statobj.st_mtime)
+    response["Vary"] = "Accept-Encoding"
+    response["Cache-Control"] = IMMUTABLE_CACHE if HASHED_NAME_RE.search(path) else DEFAULT_CACHE
+    return response
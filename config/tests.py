@@ -0,0 +1,209 @@
+import gzip
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from lms.models import Course
+from users.models import CustomUser
+
+from . import static
+from .media import ContentHashStorage
+
+CONTENT = b"0123456789" * 10
+
+
+class MediaTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_ACCEL_MODE="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.author = CustomUser.objects.create(username="author")
+        self.student = CustomUser.objects.create(username="student")
+        self.staff = CustomUser.objects.create(username="staff", is_staff=True)
+        self.draft = Course(
+            title="Черновик",
+            short_description="Кратко",
+            full_description="Полностью",
+            price=0,
+            author=self.author,
+        )
+        self.draft.avatar.save("аватар.png", ContentFile(CONTENT))
+        self.url = f"/media/{self.draft.avatar.name}"
+
+
+class ContentHashStorageTests(MediaTestCase):
+    def test_name_contains_content_hash(self):
+        self.assertRegex(self.draft.avatar.name, r"^courses/аватар\.[0-9a-f]{12}\.png$")
+
+    def test_same_content_reuses_file(self):
+        storage = ContentHashStorage()
+        first = storage.save("profiles/a.png", ContentFile(CONTENT))
+        second = storage.save("profiles/a.png", ContentFile(CONTENT))
+        third = storage.save("profiles/a.png", ContentFile(b"other"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, third)
+
+
+class ServeMediaTests(MediaTestCase):
+    def test_draft_avatar_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        for user in (self.author, self.staff):
+            self.client.force_login(user)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b"".join(response.streaming_content), CONTENT)
+            self.assertEqual(response["Cache-Control"], "private, max-age=31536000, immutable")
+
+    def test_published_avatar_is_public(self):
+        self.draft.publish = True
+        self.draft.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+
+    def test_user_avatar_is_public(self):
+        self.student.avatar.save("me.png", ContentFile(b"avatar"))
+        response = self.client.get(f"/media/{self.student.avatar.name}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+
+    def test_access_check_is_one_query(self):
+        self.draft.publish = True
+        self.draft.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_unknown_and_traversal_paths(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get("/media/courses/missing.png").status_code, 404)
+        self.assertEqual(self.client.get("/media/../config/settings.py").status_code, 404)
+
+    def test_range_requests(self):
+        self.client.force_login(self.author)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 5-9/100")
+        self.assertEqual(response["Content-Length"], "5")
+        self.assertEqual(b"".join(response.streaming_content), b"56789")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"789")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=500-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */100")
+
+    def test_accel_redirect(self):
+        self.client.force_login(self.author)
+        with self.settings(MEDIA_ACCEL_MODE="nginx", MEDIA_ACCEL_PREFIX="/protected-media/"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["X-Accel-Redirect"], quote(f"/protected-media/{self.draft.avatar.name}"))
+        self.assertTrue(response["X-Accel-Redirect"].isascii())
+        self.assertEqual(response["Content-Type"], "image/png")
+
+    def test_sendfile(self):
+        self.client.force_login(self.author)
+        with self.settings(MEDIA_ACCEL_MODE="sendfile"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["X-Sendfile"], quote(self.draft.avatar.path))
+
+
+class CompressedStaticStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = static.CompressedManifestStaticFilesStorage(location=self.root)
+
+    def test_writes_compressed_copies(self):
+        content = b"body { color: red; }\n" * 200
+        name = self.storage.save("css/site.0123456789ab.css", ContentFile(content))
+        self.storage.compress(name)
+
+        with self.storage.open(name + ".gz") as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), content)
+        with self.storage.open(name + ".br") as compressed:
+            self.assertEqual(static.brotli.decompress(compressed.read()), content)
+
+    def test_skips_incompressible_files(self):
+        name = self.storage.save("js/random.0123456789ab.js", ContentFile(os.urandom(4096)))
+        self.storage.compress(name)
+        self.assertFalse(self.storage.exists(name + ".gz"))
+        self.assertFalse(self.storage.exists(name + ".br"))
+
+
+class AcceptedEncodingsTests(SimpleTestCase):
+    def test_parses_header(self):
+        self.assertEqual(static.accepted_encodings("gzip, deflate, br"), {"gzip", "deflate", "br"})
+        self.assertEqual(static.accepted_encodings("br;q=0, GZIP;q=0.5"), {"gzip"})
+        self.assertEqual(static.accepted_encodings("gzip; q=0.0, br;q=bad"), set())
+        self.assertEqual(static.accepted_encodings(""), set())
+
+    def test_wildcard(self):
+        self.assertEqual(static.accepted_encodings("*"), {"*", "br", "gzip"})
+        self.assertEqual(static.accepted_encodings("br;q=0, *"), {"*", "gzip"})
+
+
+class ServeStaticTests(SimpleTestCase):
+    def setUp(self):
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(STATIC_ROOT=root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        (root / "css").mkdir()
+        for name in ("site.0123456789ab.css", "site.css"):
+            (root / "css" / name).write_bytes(b"body {}")
+        (root / "css" / "site.0123456789ab.css.gz").write_bytes(b"gz")
+        (root / "css" / "site.0123456789ab.css.br").write_bytes(b"br")
+        self.factory = RequestFactory()
+
+    def get(self, path, accept_encoding=""):
+        response = static.serve_static(self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding), path)
+        response.content_bytes = b"".join(response.streaming_content)
+        return response
+
+    def test_prefers_brotli_then_gzip(self):
+        response = self.get("css/site.0123456789ab.css", "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response.content_bytes, b"br")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+
+        response = self.get("css/site.0123456789ab.css", "gzip, br;q=0")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        response = self.get("css/site.0123456789ab.css", "*")
+        self.assertEqual(response["Content-Encoding"], "br")
+
+        response = self.get("css/site.0123456789ab.css")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content_bytes, b"body {}")
+
+    def test_unhashed_name_is_not_immutable(self):
+        response = self.get("css/site.css", "gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+
+
+class StaticDefaultsTests(TestCase):
+    def test_home_renders_without_collectstatic(self):
+        self.assertEqual(self.client.get("/").status_code, 200)
@@ -1,16 +1,20 @@
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 
 from config import settings
+from config.media import serve_media
+from config.static import serve_static
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path('', include('landing.urls')),
     path("api/lms/", include("lms.urls")),
     path("users/", include("users.urls")),
+    re_path(rf"^{settings.MEDIA_URL.lstrip('/')}(?P<path>.+)$", serve_media, name="media"),
 ]
 
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.SERVE_STATIC and not settings.DEBUG:
+    urlpatterns += [
+        re_path(rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.+)$", serve_static, name="static"),
+    ]
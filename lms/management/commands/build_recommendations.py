@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from lms.recommendations import TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает рекомендации «Студенты также смотрели». Запускается периодически (cron).
+    """
+
+    help = "Строит похожие курсы по TrafficCourse"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Пересчитать все курсы, а не только с новым трафиком")
+        parser.add_argument("--top-k", type=int, default=TOP_K, help="Сколько похожих курсов хранить")
+
+    def handle(self, *args, **options):
+        updated = build_recommendations(full=options["full"], top_k=options["top_k"])
+        self.stdout.write(self.style.SUCCESS(f"Обновлено курсов: {updated}"))
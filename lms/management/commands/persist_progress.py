@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from lms.progress import persist_progress
+
+
+class Command(BaseCommand):
+    """
+    Переносит прогресс по урокам из Redis в базу. Запускается периодически (cron).
+    """
+
+    help = "Сохраняет прогресс студентов из Redis в LessonProgress"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Сколько записей сохранять за раз")
+
+    def handle(self, *args, **options):
+        saved = persist_progress(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Сохранено записей прогресса: {saved}"))
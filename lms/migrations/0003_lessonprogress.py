@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LessonProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bits', models.BinaryField(default=bytes, verbose_name='Пройденные уроки')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлён')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='lms.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lesson_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Прогресс по курсу',
+                'verbose_name_plural': 'Прогресс по курсам',
+                'unique_together': {('user', 'course')},
+            },
+        ),
+    ]
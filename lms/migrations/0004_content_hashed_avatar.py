@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:34
+
+import config.media
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0003_lessonprogress'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='avatar',
+            field=models.ImageField(storage=config.media.ContentHashStorage(), upload_to='courses/', verbose_name='Аватар курса'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0004_content_hashed_avatar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseNeighbours',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='neighbours', serialize=False, to='lms.course')),
+                ('neighbours', models.JSONField(default=list, verbose_name='Похожие курсы')),
+                ('scores', models.JSONField(default=list, verbose_name='Похожесть')),
+                ('last_traffic_id', models.PositiveBigIntegerField(default=0, verbose_name='Последняя учтённая запись трафика')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Похожие курсы',
+                'verbose_name_plural': 'Похожие курсы',
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:41
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0005_courseneighbours'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lesson',
+            name='order',
+            field=models.PositiveIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(4095)], verbose_name='Порядок'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:50
+
+import config.media
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms', '0007_enrollment'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='avatar',
+            field=models.ImageField(db_index=True, storage=config.media.ContentHashStorage(), upload_to='courses/', verbose_name='Аватар курса'),
+        ),
+    ]
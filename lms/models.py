@@ -1,12 +1,18 @@
 from django.contrib.auth import get_user_model
+from django.core.validators import MaxValueValidator
 from django.db import models
 from django.db.models import ForeignKey
 from rest_framework.fields import SlugField, IntegerField
 from tinymce.models import HTMLField
 from django.utils.translation import gettext_lazy as _
 
+from config.media import ContentHashStorage
+
 User = get_user_model()
 
+# Порядковый номер урока — это номер бита в маске прогресса (LessonProgress), поэтому он ограничен
+MAX_LESSON_ORDER = 4095
+
 # Все поля можно найти в fields. Для этого зажав ctrl нажмите на fields в ссылке: django.db.models.fields
 class Course(models.Model):
     class Status(models.TextChoices):
@@ -18,7 +24,7 @@ class Course(models.Model):
     short_description = models.CharField(max_length=255, verbose_name="Краткое описание")
     full_description = HTMLField(verbose_name="Полное описание")
     price = models.PositiveIntegerField(verbose_name="Цена")
-    avatar = models.ImageField(verbose_name="Аватар курса")
+    avatar = models.ImageField(verbose_name="Аватар курса", upload_to="courses/", storage=ContentHashStorage(), db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=2,
@@ -51,7 +57,7 @@ class Lesson(models.Model):
     content = models.TextField(_("Контент"))
     video_url = models.URLField(_("Видео"), blank=True, null=True)
     duration_minutes = models.PositiveIntegerField(_("Продолжительность (мин)"), default=1)
-    order = models.PositiveIntegerField(_("Порядок"), default=0)
+    order = models.PositiveIntegerField(_("Порядок"), default=0, validators=[MaxValueValidator(MAX_LESSON_ORDER)])
     is_published = models.BooleanField(_("Опубликован"), default=False)
     created_at = models.DateTimeField(_("Создан"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Обновлён"), auto_now=True)
@@ -66,6 +72,30 @@ class Lesson(models.Model):
         return f"{self.course.title} · {self.title}"
 
 
+class Enrollment(models.Model):
+    """
+    Запись студента на курс. Отмечать уроки пройденными (LessonProgress) могут только записанные.
+    TrafficCourse — это журнал просмотров для рекомендаций, записью на курс он не считается.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="enrollments",
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="enrollments",
+    )
+    created_at = models.DateTimeField(_("Записан"), auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "course")
+        verbose_name = _("Запись на курс")
+        verbose_name_plural = _("Записи на курсы")
+
+
 class TrafficCourse(models.Model):
     user = models.ForeignKey(
         User,
@@ -79,3 +109,51 @@ class TrafficCourse(models.Model):
     class Meta:
         verbose_name = _("Трафик курса")
         verbose_name_plural = _("Траффики курсов")
+
+
+class LessonProgress(models.Model):
+    """
+    Прогресс студента по курсу. Вместо строки на каждый урок храним битовую маску:
+    бит с номером Lesson.order выставлен, если урок пройден.
+    Актуальная маска живёт в Redis (см. lms/progress.py) и периодически сохраняется сюда.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="lesson_progress",
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="progress",
+    )
+    bits = models.BinaryField(_("Пройденные уроки"), default=bytes)
+    updated_at = models.DateTimeField(_("Обновлён"), auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "course")
+        verbose_name = _("Прогресс по курсу")
+        verbose_name_plural = _("Прогресс по курсам")
+
+
+class CourseNeighbours(models.Model):
+    """
+    Предрасчитанные рекомендации «Студенты также смотрели»: id похожих курсов по убыванию похожести.
+    Заполняется командой build_recommendations (см. lms/recommendations.py).
+    """
+
+    course = models.OneToOneField(
+        Course,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="neighbours",
+    )
+    neighbours = models.JSONField(_("Похожие курсы"), default=list)
+    scores = models.JSONField(_("Похожесть"), default=list)
+    last_traffic_id = models.PositiveBigIntegerField(_("Последняя учтённая запись трафика"), default=0)
+    updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Похожие курсы")
+        verbose_name_plural = _("Похожие курсы")
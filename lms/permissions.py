@@ -11,8 +11,8 @@ class IsInstructorOrReadOnly:
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        if hasattr(obj, "instructor"):
-            return obj.instructor == request.user
+        if hasattr(obj, "author"):
+            return obj.author == request.user
         if hasattr(obj, "course"):
-            return obj.course.instructor == request.user
+            return obj.course.author == request.user
         return False
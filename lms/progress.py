@@ -0,0 +1,132 @@
+"""
+Прогресс студентов по урокам.
+
+Маска пройденных уроков курса хранится в Redis строкой-битмапом
+(SETBIT по Lesson.order), поэтому отметка урока — одна атомарная команда.
+Изменённые пары (user, course) копятся в множестве DIRTY_KEY, и
+persist_progress() периодически переносит их маски в LessonProgress.
+"""
+
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+from .models import MAX_LESSON_ORDER, Lesson, LessonProgress
+
+KEY_PREFIX = "lms:progress"
+DIRTY_KEY = f"{KEY_PREFIX}:dirty"
+KEY_TTL = 60 * 60 * 24 * 30
+
+
+@lru_cache(maxsize=1)
+def get_redis():
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+
+def progress_key(user_id, course_id):
+    return f"{KEY_PREFIX}:{user_id}:{course_id}"
+
+
+def has_bit(bits, index):
+    # Порядок бит как у Redis SETBIT: бит 0 — старший бит первого байта
+    byte = index >> 3
+    return byte < len(bits) and bool(bits[byte] & (0x80 >> (index & 7)))
+
+
+def mark_lesson_complete(user_id, lesson):
+    if lesson.order > MAX_LESSON_ORDER:
+        # Иначе SETBIT по огромному смещению раздует ключ до сотен мегабайт
+        raise ValueError(f"Порядковый номер урока больше {MAX_LESSON_ORDER}.")
+
+    client = get_redis()
+    key = progress_key(user_id, lesson.course_id)
+    if not client.exists(key):
+        # Ключ вытеснен или ещё не создавался — поднимаем сохранённую маску, чтобы её не затереть
+        saved = (
+            LessonProgress.objects.filter(user_id=user_id, course_id=lesson.course_id)
+            .values_list("bits", flat=True)
+            .first()
+        )
+        client.set(key, bytes(saved or b""), nx=True)
+
+    pipe = client.pipeline()
+    pipe.setbit(key, lesson.order, 1)
+    pipe.expire(key, KEY_TTL)
+    pipe.sadd(DIRTY_KEY, f"{user_id}:{lesson.course_id}")
+    pipe.execute()
+
+
+def get_progress(user_id, course_ids):
+    """
+    Прогресс пользователя по нескольким курсам за один запрос к Redis и два к базе.
+    Учитываются только опубликованные уроки.
+    """
+
+    course_ids = list(dict.fromkeys(course_ids))
+    if not course_ids:
+        return []
+
+    pipe = get_redis().pipeline()
+    for course_id in course_ids:
+        pipe.get(progress_key(user_id, course_id))
+    masks = dict(zip(course_ids, pipe.execute()))
+
+    cold = [course_id for course_id, bits in masks.items() if bits is None]
+    if cold:
+        masks.update(
+            LessonProgress.objects.filter(user_id=user_id, course_id__in=cold).values_list("course_id", "bits")
+        )
+
+    orders = {course_id: [] for course_id in course_ids}
+    for course_id, order in Lesson.objects.filter(course_id__in=course_ids, is_published=True).values_list(
+        "course_id", "order"
+    ):
+        orders[course_id].append(order)
+
+    result = []
+    for course_id in course_ids:
+        bits = bytes(masks.get(course_id) or b"")
+        total = len(orders[course_id])
+        completed = sum(has_bit(bits, order) for order in orders[course_id])
+        result.append(
+            {
+                "course": course_id,
+                "completed": completed,
+                "total": total,
+                "percent": round(completed * 100 / total, 1) if total else 0,
+            }
+        )
+    return result
+
+
+def persist_progress(batch_size=1000):
+    """
+    Сохраняет изменённые в Redis маски в LessonProgress. Возвращает число сохранённых записей.
+    """
+
+    client = get_redis()
+    saved = 0
+    while members := client.spop(DIRTY_KEY, batch_size):
+        pairs = [tuple(int(part) for part in member.decode().split(":")) for member in members]
+        pipe = client.pipeline()
+        for user_id, course_id in pairs:
+            pipe.get(progress_key(user_id, course_id))
+        rows = [
+            LessonProgress(user_id=user_id, course_id=course_id, bits=bits)
+            for (user_id, course_id), bits in zip(pairs, pipe.execute())
+            if bits is not None
+        ]
+        try:
+            LessonProgress.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["user", "course"],
+                update_fields=["bits", "updated_at"],
+            )
+        except Exception:
+            # Возвращаем пары в очередь, чтобы не потерять их при следующем запуске
+            client.sadd(DIRTY_KEY, *members)
+            raise
+        saved += len(rows)
+    return saved
@@ -0,0 +1,125 @@
+"""
+Рекомендации «Студенты также смотрели».
+
+Матрица пользователь × курс берётся из TrafficCourse и хранится разреженно:
+для каждого пользователя — множество его курсов. Похожесть курсов a и b —
+косинус между их столбцами: co(a, b) / sqrt(n(a) * n(b)), где co — число
+общих пользователей, n — число уникальных пользователей курса.
+
+Курсы пересчитываются пачками по COURSE_CHUNK: на каждую пачку трафик
+её пользователей читается потоком, отсортированным по user_id, и в памяти
+живут только счётчики пар для курсов пачки. При инкрементальном обновлении
+пересчитываются все курсы пользователей, у которых появился трафик (id записи
+больше сохранённого last_traffic_id). Курсы, у которых изменилась только
+норма соседа, догоняет полный пересчёт (--full).
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import CourseNeighbours, TrafficCourse
+
+TOP_K = 10
+COURSE_CHUNK = 500
+TRAFFIC_CHUNK = 10000
+
+
+def dirty_course_ids(full=False):
+    """
+    Курсы, которые нужно пересчитать, и id последней записи трафика на момент расчёта.
+    """
+
+    last_traffic_id = TrafficCourse.objects.aggregate(last=Max("pk"))["last"] or 0
+    traffic = TrafficCourse.objects.filter(pk__lte=last_traffic_id)
+    if not full:
+        watermark = CourseNeighbours.objects.aggregate(last=Max("last_traffic_id"))["last"] or 0
+        # У пользователей с новым трафиком меняются пары со всеми их курсами, а не только с новыми
+        traffic = traffic.filter(user__in=traffic.filter(pk__gt=watermark).values("user"))
+    course_ids = traffic.order_by("course_id").values_list("course_id", flat=True).distinct()
+    return list(course_ids), last_traffic_id
+
+
+def cooccurrence(course_ids, last_traffic_id):
+    """
+    Счётчики общих пользователей {course: Counter({other: co})} для курсов course_ids.
+    """
+
+    targets = set(course_ids)
+    traffic = TrafficCourse.objects.filter(pk__lte=last_traffic_id)
+    rows = (
+        traffic.filter(user__in=traffic.filter(course__in=targets).values("user"))
+        .order_by("user_id")
+        .values_list("user_id", "course_id")
+        .iterator(chunk_size=TRAFFIC_CHUNK)
+    )
+    counts = defaultdict(Counter)
+    for _, user_rows in groupby(rows, key=itemgetter(0)):
+        viewed = {course_id for _, course_id in user_rows}
+        for course_id in viewed & targets:
+            counts[course_id].update(viewed)
+    return counts
+
+
+def top_neighbours(counts, last_traffic_id, top_k=TOP_K):
+    """
+    Переводит счётчики в косинусную похожесть и оставляет top_k соседей каждого курса.
+    """
+
+    course_ids = set(counts)
+    for course_counts in counts.values():
+        course_ids.update(course_counts)
+    users_per_course = dict(
+        TrafficCourse.objects.filter(pk__lte=last_traffic_id, course__in=course_ids)
+        .values("course")
+        .annotate(users=Count("user", distinct=True))
+        .values_list("course", "users")
+    )
+
+    rows = []
+    for course_id, course_counts in counts.items():
+        norm = users_per_course[course_id]
+        scored = (
+            (co / math.sqrt(norm * users_per_course[other]), other)
+            for other, co in course_counts.items()
+            if other != course_id
+        )
+        best = heapq.nlargest(top_k, scored)
+        rows.append(
+            CourseNeighbours(
+                course_id=course_id,
+                neighbours=[other for _, other in best],
+                scores=[round(score, 6) for score, _ in best],
+                last_traffic_id=last_traffic_id,
+            )
+        )
+    return rows
+
+
+def build_recommendations(full=False, top_k=TOP_K):
+    """
+    Пересчитывает соседей для курсов с новым трафиком (или для всех при full=True).
+    Возвращает число обновлённых курсов.
+    """
+
+    updated = 0
+    # Водяной знак — максимум last_traffic_id, поэтому пачки пишутся одной транзакцией:
+    # если запуск упадёт посередине, следующий начнёт с того же места
+    with transaction.atomic():
+        course_ids, last_traffic_id = dirty_course_ids(full=full)
+        for start in range(0, len(course_ids), COURSE_CHUNK):
+            chunk = course_ids[start:start + COURSE_CHUNK]
+            rows = top_neighbours(cooccurrence(chunk, last_traffic_id), last_traffic_id, top_k=top_k)
+            CourseNeighbours.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["course"],
+                update_fields=["neighbours", "scores", "last_traffic_id", "updated_at"],
+            )
+            updated += len(rows)
+    return updated
@@ -1,4 +1,6 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from .models import Course, Lesson
 
@@ -25,26 +27,131 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = (
             "id",
             "title",
-            "slug",
             "short_description",
             "full_description",
             "avatar",
             "price",
-            "is_free",
-            "is_published",
+            "status",
+            "publish",
             "created_at",
             "updated_at",
-            "instructor",
-            "instructor_name",
-            "lessons",
-            "lesson_count",
+            "author",
         )
-
-    def get_lesson_count(self, obj):
-        return obj.lessons.count()
+        read_only_fields = ("id", "created_at", "updated_at", "author")
 
     def create(self, validated_data):
         request = self.context.get("request")
         if request and request.user.is_authenticated:
-            validated_data.setdefault("instructor", request.user)
+            validated_data.setdefault("author", request.user)
         return super().create(validated_data)
+
+
+class ValuesPlan:
+    """
+    Предрасчитанный план быстрой read-only сериализации через QuerySet.values().
+
+    Для каждого поля сериализатора заранее выбираем колонку и функцию
+    преобразования, поэтому на каждой строке не создаётся модель и не
+    вызывается весь механизм ModelSerializer. Результат совпадает с
+    ``serializer_class(many=True).data``.
+    """
+
+    def __init__(self, columns, mappers):
+        self.columns = columns
+        self.mappers = mappers
+
+    def values(self, queryset):
+        # Для строк values() prefetch не нужен, select_related values() игнорирует сам
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def serialize(self, rows, request=None):
+        mappers = [
+            (name, source, mapper(request) if needs_request else mapper)
+            for name, source, mapper, needs_request in self.mappers
+        ]
+        return [
+            {
+                name: None if row[source] is None else (mapper(row[source]) if mapper else row[source])
+                for name, source, mapper in mappers
+            }
+            for row in rows
+        ]
+
+
+# Поля, у которых to_representation для значений из БД ничего не меняет
+_PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+_values_plans = {}
+
+
+def _file_mapper(storage, use_url):
+    def bind(request):
+        def to_representation(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return to_representation
+
+    return bind
+
+
+def _build_values_plan(serializer_class):
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    columns = []
+    mappers = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source == "*" or "." in source:
+            return None
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                return None
+            mapper, needs_request = None, False
+        elif isinstance(field, (serializers.RelatedField, serializers.BaseSerializer, serializers.SerializerMethodField)):
+            return None
+        elif isinstance(field, serializers.FileField):
+            use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+            mapper, needs_request = _file_mapper(model_field.storage, use_url), True
+        elif isinstance(field, _PASSTHROUGH_FIELDS):
+            mapper, needs_request = None, False
+        else:
+            mapper, needs_request = field.to_representation, False
+
+        columns.append(source)
+        mappers.append((name, source, mapper, needs_request))
+    return ValuesPlan(columns, mappers)
+
+
+def get_values_plan(serializer_class):
+    """
+    План для serializer_class или None, если сериализатор нельзя разложить на колонки
+    (method-поля, вложенные сериализаторы, source через точку и т.п.).
+    Неверно настроенный сериализатор тоже даёт None: ошибку покажет обычный list().
+    """
+
+    if serializer_class not in _values_plans:
+        try:
+            _values_plans[serializer_class] = _build_values_plan(serializer_class)
+        except ImproperlyConfigured:
+            _values_plans[serializer_class] = None
+    return _values_plans[serializer_class]
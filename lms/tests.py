@@ -1,3 +1,356 @@
+from unittest.mock import patch
+
 from django.test import TestCase
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+
+from . import progress, recommendations
+from .models import MAX_LESSON_ORDER, Course, CourseNeighbours, Enrollment, Lesson, LessonProgress, TrafficCourse
+from .renderers import FastJSONRenderer
+from .serializers import CourseSerializer, LessonSerializer, get_values_plan
+from .views import LessonViewSet
+
+
+def create_course(author, publish=True, **kwargs):
+    fields = {
+        "title": "Курс",
+        "short_description": "Кратко",
+        "full_description": "<p>Полностью</p>",
+        "price": 100,
+        "avatar": "courses/avatar.0123456789ab.png",
+        "publish": publish,
+        "author": author,
+    }
+    fields.update(kwargs)
+    return Course.objects.create(**fields)
+
+
+class ValuesPlanTests(TestCase):
+    def setUp(self):
+        author = CustomUser.objects.create(username="author")
+        course = create_course(author)
+        for order in range(3):
+            Lesson.objects.create(course=course, title=f"Урок {order}", content="Текст", order=order)
+
+    def test_lesson_values_match_serializer(self):
+        queryset = Lesson.objects.all()
+        plan = get_values_plan(LessonSerializer)
+        self.assertIsNotNone(plan)
+        self.assertEqual(plan.serialize(plan.values(queryset)), LessonSerializer(queryset, many=True).data)
+
+    def test_course_values_match_serializer(self):
+        queryset = Course.objects.all()
+        plan = get_values_plan(CourseSerializer)
+        self.assertIsNotNone(plan)
+        self.assertEqual(plan.serialize(plan.values(queryset)), CourseSerializer(queryset, many=True).data)
+
+
+class ValuesListViewTests(APITestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create(username="author")
+        course = create_course(self.author)
+        draft = create_course(self.author, publish=False, title="Черновик")
+        for order in range(5):
+            Lesson.objects.create(course=course, title=f"Урок {order}", content="Текст", order=order, is_published=True)
+        Lesson.objects.create(course=course, title="Скрытый", content="Текст", order=10)
+        Lesson.objects.create(course=draft, title="Урок черновика", content="Текст", order=0, is_published=True)
+
+    def test_lessons_list_matches_serializer(self):
+        response = self.client.get("/api/lms/lessons/")
+        self.assertEqual(response.status_code, 200)
+        expected = LessonSerializer(Lesson.objects.filter(is_published=True, course__publish=True), many=True).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_courses_list_matches_serializer(self):
+        response = self.client.get("/api/lms/courses/")
+        self.assertEqual(response.status_code, 200)
+        expected = CourseSerializer(
+            Course.objects.filter(publish=True), many=True, context={"request": response.wsgi_request}
+        ).data
+        self.assertEqual(response.json(), expected)
+
+    def test_course_retrieve_is_single_query(self):
+        course = Course.objects.get(publish=True)
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/lms/courses/{course.pk}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_author_sees_own_drafts(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.get("/api/lms/courses/")
+        self.assertEqual(len(response.json()), 2)
+
+    @patch.object(LessonViewSet, "pagination_class", LimitOffsetPagination)
+    def test_paginated_lessons_list(self):
+        response = self.client.get("/api/lms/lessons/", {"limit": 2, "offset": 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        expected = LessonSerializer(Lesson.objects.filter(is_published=True, course__publish=True)[1:3], many=True).data
+        self.assertEqual(data["results"], expected)
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_json_renderer(self):
+        data = {"title": "Урок ", "price": 10, "items": [1, None, True]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_on_big_integers(self):
+        data = {"value": 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class FakeRedis:
+    """
+    Минимальная замена redis.Redis для команд, которые использует lms/progress.py.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def get(self, key):
+        value = self.data.get(key)
+        return bytes(value) if isinstance(value, bytearray) else value
+
+    def set(self, key, value, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = bytes(value)
+        return True
+
+    def setbit(self, key, offset, value):
+        bits = bytearray(self.data.get(key, b""))
+        if len(bits) <= offset >> 3:
+            bits.extend(bytes((offset >> 3) + 1 - len(bits)))
+        mask = 0x80 >> (offset & 7)
+        old = int(bool(bits[offset >> 3] & mask))
+        bits[offset >> 3] = bits[offset >> 3] | mask if value else bits[offset >> 3] & ~mask
+        self.data[key] = bytes(bits)
+        return old
+
+    def expire(self, key, seconds):
+        return int(key in self.data)
+
+    def sadd(self, key, *members):
+        members = {member.encode() if isinstance(member, str) else member for member in members}
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+
+    def spop(self, key, count):
+        members = self.data.get(key, set())
+        popped = [members.pop() for _ in range(min(count, len(members)))]
+        return popped or None
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((getattr(self.client, name), args, kwargs))
+            return self
+
+        return command
+
+    def execute(self):
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+class ProgressTests(TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch.object(progress, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.student = CustomUser.objects.create(username="student")
+        author = CustomUser.objects.create(username="author")
+        self.course = create_course(author)
+        self.other_course = create_course(author, title="Другой курс")
+        self.lessons = [
+            Lesson.objects.create(course=self.course, title=f"Урок {order}", content="Текст", order=order, is_published=True)
+            for order in range(10)
+        ]
+        Lesson.objects.create(course=self.course, title="Скрытый", content="Текст", order=10)
+
+    def test_mark_and_read_progress(self):
+        progress.mark_lesson_complete(self.student.pk, self.lessons[0])
+        progress.mark_lesson_complete(self.student.pk, self.lessons[9])
+        progress.mark_lesson_complete(self.student.pk, self.lessons[9])
+
+        self.assertEqual(
+            progress.get_progress(self.student.pk, [self.course.pk, self.other_course.pk]),
+            [
+                {"course": self.course.pk, "completed": 2, "total": 10, "percent": 20.0},
+                {"course": self.other_course.pk, "completed": 0, "total": 0, "percent": 0},
+            ],
+        )
+
+    def test_persist_and_restore_from_database(self):
+        progress.mark_lesson_complete(self.student.pk, self.lessons[3])
+        self.assertEqual(progress.persist_progress(), 1)
+        self.assertEqual(bytes(LessonProgress.objects.get().bits), b"\x10")
+        self.assertEqual(progress.persist_progress(), 0)
+
+        # Redis потерял ключ: чтение берёт маску из базы, новая отметка её не затирает
+        self.redis.data.clear()
+        self.assertEqual(progress.get_progress(self.student.pk, [self.course.pk])[0]["completed"], 1)
+        progress.mark_lesson_complete(self.student.pk, self.lessons[4])
+        self.assertEqual(progress.get_progress(self.student.pk, [self.course.pk])[0]["completed"], 2)
+        progress.persist_progress()
+        self.assertEqual(bytes(LessonProgress.objects.get().bits), b"\x18")
+
+    def test_rejects_too_large_order(self):
+        lesson = Lesson(course=self.course, order=MAX_LESSON_ORDER + 1)
+        with self.assertRaises(ValueError):
+            progress.mark_lesson_complete(self.student.pk, lesson)
+        self.assertEqual(self.redis.data, {})
+
+
+class ProgressViewTests(APITestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = patch.object(progress, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.student = CustomUser.objects.create(username="student")
+        author = CustomUser.objects.create(username="author")
+        self.course = create_course(author)
+        self.draft = create_course(author, publish=False)
+        self.lesson = Lesson.objects.create(course=self.course, title="Урок", content="Текст", is_published=True)
+        Lesson.objects.create(course=self.course, title="Урок 2", content="Текст", order=1, is_published=True)
+        self.client.force_authenticate(self.student)
+
+    def test_complete_requires_enrollment(self):
+        # Просмотр курса (TrafficCourse) записью на курс не считается
+        TrafficCourse.objects.create(user=self.student, course=self.course)
+        response = self.client.post(f"/api/lms/lessons/{self.lesson.pk}/complete/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_enroll(self):
+        response = self.client.post(f"/api/lms/courses/{self.course.pk}/enroll/")
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(f"/api/lms/courses/{self.course.pk}/enroll/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Enrollment.objects.filter(user=self.student, course=self.course).count(), 1)
+
+        # На чужой черновик записаться нельзя
+        response = self.client.post(f"/api/lms/courses/{self.draft.pk}/enroll/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_complete_and_read_progress(self):
+        self.client.post(f"/api/lms/courses/{self.course.pk}/enroll/")
+
+        response = self.client.post(f"/api/lms/lessons/{self.lesson.pk}/complete/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"course": self.course.pk, "completed": 1, "total": 2, "percent": 50.0})
+
+        # Черновик чужого курса в ответ не попадает
+        response = self.client.get("/api/lms/courses/progress/", {"ids": f"{self.course.pk},{self.draft.pk}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["course"] for row in response.json()], [self.course.pk])
+
+    def test_progress_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get("/api/lms/courses/progress/", {"ids": str(self.course.pk)})
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_progress_rejects_bad_ids(self):
+        response = self.client.get("/api/lms/courses/progress/", {"ids": "1,x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class RecommendationsTests(TestCase):
+    def setUp(self):
+        author = CustomUser.objects.create(username="author")
+        self.courses = [create_course(author, title=f"Курс {index}") for index in range(5)]
+        self.users = [CustomUser.objects.create(username=f"student{index}") for index in range(4)]
+        self.view(0, 0, 1, 2)
+        self.view(1, 0, 1)
+        self.view(2, 0, 2, 2)
+        self.view(3, 3, 4)
+
+    def view(self, user, *courses):
+        TrafficCourse.objects.bulk_create(
+            TrafficCourse(user=self.users[user], course=self.courses[index]) for index in courses
+        )
+
+    def neighbours(self, index):
+        row = CourseNeighbours.objects.get(course=self.courses[index])
+        pk_to_index = {course.pk: position for position, course in enumerate(self.courses)}
+        return [pk_to_index[pk] for pk in row.neighbours], row.scores
+
+    def test_cosine_scores_and_order(self):
+        self.assertEqual(recommendations.build_recommendations(), 5)
+
+        # co(0, 1) = 2, n(0) = 3 (повторный просмотр не считается), n(1) = 2 -> 2 / sqrt(6)
+        self.assertEqual(self.neighbours(0), ([2, 1], [0.816497, 0.816497]))
+        self.assertEqual(self.neighbours(1), ([0, 2], [0.816497, 0.5]))
+        self.assertEqual(self.neighbours(3), ([4], [1.0]))
+
+    def test_top_k(self):
+        recommendations.build_recommendations(top_k=1)
+        self.assertEqual(self.neighbours(1), ([0], [0.816497]))
+
+    def test_incremental_refreshes_co_viewed_courses(self):
+        recommendations.build_recommendations()
+        self.assertEqual(recommendations.build_recommendations(), 0)
+
+        # Студент курсов 3 и 4 открыл курс 0: меняются соседи и у курса 4, где нового трафика нет
+        self.view(3, 0)
+        self.assertEqual(recommendations.build_recommendations(), 3)
+        self.assertEqual(self.neighbours(4), ([3, 0], [1.0, 0.5]))
+
+    @patch.object(recommendations, "COURSE_CHUNK", 2)
+    def test_failed_run_keeps_watermark(self):
+        original = recommendations.top_neighbours
+        calls = []
+
+        def fail_on_second_chunk(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+            return original(*args, **kwargs)
+
+        with patch.object(recommendations, "top_neighbours", fail_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                recommendations.build_recommendations()
+        self.assertFalse(CourseNeighbours.objects.exists())
+        self.assertEqual(recommendations.build_recommendations(), 5)
+
+
+class RecommendationsViewTests(APITestCase):
+    def test_returns_visible_neighbours_in_order(self):
+        author = CustomUser.objects.create(username="author")
+        course = create_course(author)
+        first = create_course(author, title="Первый")
+        second = create_course(author, title="Второй")
+        draft = create_course(author, publish=False, title="Черновик")
+        CourseNeighbours.objects.create(course=course, neighbours=[second.pk, draft.pk, first.pk])
+
+        # Одна выборка CourseNeighbours по ключу и один in_bulk
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/lms/courses/{course.pk}/recommendations/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], [second.pk, first.pk])
+
+        response = self.client.get(f"/api/lms/courses/{first.pk}/recommendations/")
+        self.assertEqual(response.json(), [])
 
-# Create your tests here.
+        CourseNeighbours.objects.create(course=draft, neighbours=[course.pk])
+        self.assertEqual(self.client.get(f"/api/lms/courses/{draft.pk}/recommendations/").status_code, 404)
+        self.assertEqual(self.client.get("/api/lms/courses/abc/recommendations/").status_code, 404)
@@ -1,39 +1,64 @@
 from django.db.models import Q
-from rest_framework import permissions, viewsets
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
-from .models import Course, Lesson
+from .models import Course, CourseNeighbours, Enrollment, Lesson
 from .permissions import IsInstructorOrReadOnly
-from .serializers import CourseSerializer, LessonSerializer
+from .progress import get_progress, mark_lesson_complete
+from .renderers import FastJSONRenderer
+from .serializers import CourseSerializer, LessonSerializer, get_values_plan
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class ValuesListMixin:
+    """
+    Быстрый read-only list(): ответ строится из QuerySet.values() без создания моделей.
+    Если сериализатор нельзя разложить на колонки, работает обычный list().
+    """
+
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        plan = get_values_plan(self.get_serializer_class())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, request))
+        return Response(plan.serialize(queryset, request))
+
+
+class CourseViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
 
     def get_queryset(self):
         user = self.request.user
-        base_qs = Course.objects.select_related("instructor").prefetch_related("lessons")
+        base_qs = Course.objects.all()
         if not user.is_authenticated or not user.is_staff:
             # Анонимам и студентам показываем только опубликованные курсы
-            filter_kwargs = {"is_published": True}
+            filter_kwargs = {"publish": True}
             if user.is_authenticated:
                 # Инструктор видит свои черновики + общую витрину
-                return base_qs.filter(Q(**filter_kwargs) | Q(instructor=user))
+                return base_qs.filter(Q(**filter_kwargs) | Q(author=user))
             return base_qs.filter(**filter_kwargs)
         return base_qs
 
     def get_permissions(self):
         if self.action in {"create", "update", "partial_update", "destroy"}:
             return [permissions.IsAuthenticated(), IsInstructorOrReadOnly()]
+        if self.action in {"progress", "enroll"}:
+            return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
     def perform_create(self, serializer):
         if not self.request.user.is_instructor:
             raise PermissionDenied("Создавать курсы могут только инструкторы.")
-        serializer.save(instructor=self.request.user)
+        serializer.save(author=self.request.user)
 
     @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
     def lessons(self, request, pk=None):
@@ -46,32 +71,93 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer = LessonSerializer(lessons, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def recommendations(self, request, pk=None):
+        """
+        /courses/<id>/recommendations/ — «Студенты также смотрели», посчитано заранее build_recommendations.
+        """
+
+        try:
+            course_id = int(pk)
+        except ValueError:
+            raise NotFound()
+        neighbour_ids = (
+            CourseNeighbours.objects.filter(course_id=course_id).values_list("neighbours", flat=True).first() or []
+        )
+        # Сам курс берём тем же in_bulk: он нужен только для проверки видимости
+        courses = self.get_queryset().in_bulk([course_id, *neighbour_ids])
+        if course_id not in courses:
+            raise NotFound()
+        serializer = self.get_serializer([courses[pk] for pk in neighbour_ids if pk in courses], many=True)
+        return Response(serializer.data)
 
-class LessonViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def enroll(self, request, pk=None):
+        """
+        Записывает текущего пользователя на курс. Повторная запись ничего не меняет.
+        """
+
+        course = self.get_object()
+        _, created = Enrollment.objects.get_or_create(user=request.user, course=course)
+        return Response({"course": course.pk, "enrolled": True}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def progress(self, request):
+        """
+        /courses/progress/?ids=1,2,3 — прогресс текущего пользователя сразу по нескольким курсам.
+        """
+
+        try:
+            course_ids = [int(pk) for pk in request.query_params.get("ids", "").split(",") if pk]
+        except ValueError:
+            raise ValidationError({"ids": "Ожидается список id курсов через запятую."})
+        course_ids = self.get_queryset().filter(pk__in=course_ids).values_list("pk", flat=True)
+        return Response(get_progress(request.user.pk, course_ids))
+
+
+class LessonViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
 
     def get_queryset(self):
         user = self.request.user
-        base_qs = Lesson.objects.select_related("course", "course__instructor")
+        base_qs = Lesson.objects.select_related("course", "course__author")
         if not user.is_authenticated:
-            return base_qs.filter(is_published=True, course__is_published=True)
+            return base_qs.filter(is_published=True, course__publish=True)
         if user.is_staff:
             return base_qs
 
         return base_qs.filter(
-            Q(is_published=True, course__is_published=True) | Q(course__instructor=user)
+            Q(is_published=True, course__publish=True) | Q(course__author=user)
         )
 
     def get_permissions(self):
         if self.action in {"create", "update", "partial_update", "destroy"}:
             return [permissions.IsAuthenticated(), IsInstructorOrReadOnly()]
+        if self.action == "complete":
+            return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
     def perform_create(self, serializer):
         if not self.request.user.is_instructor:
             raise PermissionDenied("Создавать уроки могут только инструкторы.")
         course = serializer.validated_data.get("course")
-        if course.instructor != self.request.user:
+        if course.author != self.request.user:
             raise PermissionDenied("Добавлять уроки можно только в свои курсы.")
         serializer.save()
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def complete(self, request, pk=None):
+        """
+        Отмечает урок пройденным для текущего пользователя.
+        Доступно только студентам, записанным на курс (POST /courses/<id>/enroll/).
+        """
+
+        lesson = self.get_object()
+        if not Enrollment.objects.filter(user=request.user, course_id=lesson.course_id).exists():
+            raise PermissionDenied("Отмечать уроки могут только студенты, записанные на курс.")
+        try:
+            mark_lesson_complete(request.user.pk, lesson)
+        except ValueError as exc:
+            raise ValidationError({"order": str(exc)})
+        return Response(get_progress(request.user.pk, [lesson.course_id])[0])
@@ -0,0 +1,120 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import CustomUser
+
+TRUE_VALUES = {"1", "true", "yes", "y", "да"}
+
+
+def _setup_worker():
+    # При старте через spawn воркер ничего не знает про настройки Django
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+
+def _hash_password(raw_password):
+    # Пустой пароль -> непригодный пароль, как у set_unusable_password()
+    return make_password(raw_password or None)
+
+
+class Command(BaseCommand):
+    """
+    Массовое создание пользователей из CSV.
+
+    Ожидаемые колонки: username, password и необязательные email, first_name,
+    last_name, headline, is_instructor. Пароли хешируются в пуле процессов,
+    пользователи вставляются пачками через bulk_create. Уже существующие
+    username (в базе или выше в файле) пропускаются.
+    """
+
+    help = "Создаёт пользователей из CSV-файла пачками"
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="Путь к CSV-файлу с пользователями")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Размер пачки для bulk_create")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Число процессов для хеширования паролей (по умолчанию — все ядра)",
+        )
+        parser.add_argument("--delimiter", default=",", help="Разделитель CSV")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size должен быть больше нуля.")
+        workers = options["workers"]
+        if workers is None or workers < 1:
+            raise CommandError("--workers должен быть больше нуля.")
+
+        try:
+            csv_file = open(options["csv_path"], newline="", encoding="utf-8-sig")
+        except OSError as exc:
+            raise CommandError(f"Не удалось открыть {options['csv_path']}: {exc}")
+
+        created = skipped = 0
+        seen = set()
+        with csv_file, ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+            reader = csv.DictReader(csv_file, delimiter=options["delimiter"])
+            missing = {"username", "password"} - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f"В CSV нет обязательных колонок: {', '.join(sorted(missing))}")
+
+            while batch := list(islice(reader, batch_size)):
+                rows = self.new_rows(batch, seen)
+                skipped += len(batch) - len(rows)
+                if not rows:
+                    continue
+
+                hashes = pool.map(
+                    _hash_password,
+                    [row["password"] for row in rows],
+                    chunksize=max(1, len(rows) // workers),
+                )
+                users = [self.build_user(row, password) for row, password in zip(rows, hashes)]
+                # ignore_conflicts страхует от гонки с параллельной регистрацией
+                CustomUser.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+                # Строки, отброшенные ignore_conflicts, не считаем: сверяемся с базой по хешу пароля
+                inserted = CustomUser.objects.filter(
+                    username__in=[user.username for user in users],
+                    password__in=[user.password for user in users],
+                ).count()
+                created += inserted
+                skipped += len(users) - inserted
+                self.stdout.write(f"Обработано: {created + skipped}")
+
+        self.stdout.write(self.style.SUCCESS(f"Создано пользователей: {created}, пропущено: {skipped}"))
+
+    def new_rows(self, batch, seen):
+        """
+        Отбрасывает строки без username и дубликаты — внутри файла и уже существующие в базе.
+        """
+
+        rows = {}
+        for row in batch:
+            username = CustomUser.normalize_username((row.get("username") or "").strip())
+            if username and username not in seen and username not in rows:
+                rows[username] = row
+        existing = set(
+            CustomUser.objects.filter(username__in=rows.keys()).values_list("username", flat=True)
+        )
+        seen.update(rows.keys())
+        return [dict(row, username=username) for username, row in rows.items() if username not in existing]
+
+    def build_user(self, row, password):
+        return CustomUser(
+            username=row["username"],
+            password=password,
+            email=CustomUser.objects.normalize_email((row.get("email") or "").strip()),
+            first_name=(row.get("first_name") or "").strip(),
+            last_name=(row.get("last_name") or "").strip(),
+            headline=(row.get("headline") or "").strip(),
+            is_instructor=(row.get("is_instructor") or "").strip().lower() in TRUE_VALUES,
+        )
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:34
+
+import config.media
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=config.media.ContentHashStorage(), upload_to='profiles/', verbose_name='Аватар'),
+        ),
+    ]
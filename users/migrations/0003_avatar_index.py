@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:50
+
+import config.media
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_content_hashed_avatar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='avatar',
+            field=models.ImageField(blank=True, db_index=True, null=True, storage=config.media.ContentHashStorage(), upload_to='profiles/', verbose_name='Аватар'),
+        ),
+    ]
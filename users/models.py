@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from config.media import ContentHashStorage
+
 
 class CustomUser(AbstractUser):
     """
@@ -10,7 +12,7 @@ class CustomUser(AbstractUser):
     headline = models.CharField("Короткий заголовок", max_length=120, blank=True)
     bio = models.TextField("О себе", blank=True)
     is_instructor = models.BooleanField("Может создавать курсы", default=False)
-    avatar = models.ImageField("Аватар", upload_to="profiles/", blank=True, null=True)
+    avatar = models.ImageField("Аватар", upload_to="profiles/", storage=ContentHashStorage(), blank=True, null=True, db_index=True)
 
     def __str__(self):
         return self.get_full_name() or self.username
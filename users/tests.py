@@ -1,3 +1,50 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 
-# Create your tests here.
+from .models import CustomUser
+
+
+class ProvisionUsersTests(TestCase):
+    def provision(self, content, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8", delete=False) as csv_file:
+            csv_file.write(content)
+        self.addCleanup(os.unlink, csv_file.name)
+        out = StringIO()
+        call_command("provision_users", csv_file.name, "--workers", "1", *args, stdout=out)
+        return out.getvalue()
+
+    def test_creates_users_and_skips_duplicates(self):
+        CustomUser.objects.create(username="existing")
+        out = self.provision(
+            "username,password,email,headline,is_instructor\n"
+            "anna,secret-1,Anna@EXAMPLE.com,Преподаватель,да\n"
+            "boris,,,,\n"
+            "anna,other,,,\n"
+            "existing,secret-2,,,\n"
+            ",no-username,,,\n",
+            "--batch-size",
+            "2",
+        )
+
+        self.assertIn("Создано пользователей: 2, пропущено: 3", out)
+        anna = CustomUser.objects.get(username="anna")
+        self.assertTrue(anna.check_password("secret-1"))
+        self.assertTrue(anna.is_instructor)
+        self.assertEqual(anna.headline, "Преподаватель")
+        self.assertEqual(anna.email, "Anna@example.com")
+        boris = CustomUser.objects.get(username="boris")
+        self.assertFalse(boris.has_usable_password())
+        self.assertFalse(boris.is_instructor)
+        self.assertFalse(CustomUser.objects.get(username="existing").check_password("secret-2"))
+
+    def test_rejects_missing_columns(self):
+        with self.assertRaisesMessage(CommandError, "password"):
+            self.provision("username,email\nanna,anna@example.com\n")
+
+    def test_rejects_non_positive_workers(self):
+        with self.assertRaisesMessage(CommandError, "--workers"):
+            call_command("provision_users", "missing.csv", "--workers", "0")